@@ -1,14 +1,36 @@
-import argparse
-import json
-import pathlib
-import shutil
+import bisect
+import itertools
+import operator
+import os
+import pickle
+import sys
 from typing import List, Dict
 
+import orjson
+
+# Files larger than this are memory-mapped instead of read into a bytes copy
+MMAP_THRESHOLD = 64 * 1024
+# Pulls both task fields out of a record in one C-level call
+TASK_FIELDS = operator.itemgetter("description", "completed")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tasktracker")
+
 class Task:
+    __slots__ = ("description", "_completed", "_repr")
+
     def __init__(self, description: str, completed: bool = False):
         self.description = description
         self.completed = completed
 
+    @property
+    def completed(self) -> bool:
+        return self._completed
+
+    @completed.setter
+    def completed(self, value: bool):
+        # The display string is rebuilt only when the status changes, not on every listing
+        self._completed = value
+        self._repr = ("✓ " if value else "☐ ") + self.description
+
     def to_dict(self) -> Dict:
         return {"description": self.description, "completed": self.completed}
 
@@ -17,41 +39,130 @@ class Task:
         return cls(description=data["description"], completed=data.get("completed", False))
 
     def __str__(self):
-        status = "✓" if self.completed else "☐"
-        return f"{status} {self.description}"
+        return self._repr
 
 class TaskTracker:
     def __init__(self):
-        self.tasks_file = pathlib.Path(__file__).parent / "tasks.json"
-        self.tasks: List[Task] = self.load_tasks()
+        # os.path instead of pathlib keeps pathlib's import cost off every command
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.tasks_file = os.path.join(base_dir, "tasks.jsonl")
+        self.legacy_file = os.path.join(base_dir, "tasks.json")
+        # Set when the file on disk could not be read back cleanly; the next add then rewrites it instead of appending
+        self._needs_rewrite = False
+        if not os.path.exists(self.tasks_file) and os.path.isfile(self.legacy_file):
+            self.tasks: List[Task] = self.load_legacy_tasks()
+            self.save_tasks()
+        else:
+            self.tasks: List[Task] = self.load_tasks()
+        # Sorted 0-based indices of tasks that are not completed yet
+        self._open: List[int] = [i for i, task in enumerate(self.tasks) if not task.completed]
 
     def load_tasks(self) -> List[Task]:
-        if not self.tasks_file.exists():
-            self.tasks_file.parent.mkdir(parents=True, exist_ok=True)
-            self.save_tasks()
+        if not os.path.exists(self.tasks_file):
+            os.makedirs(os.path.dirname(self.tasks_file), exist_ok=True)
+            open(self.tasks_file, "ab").close()
             return []
         
-        if not self.tasks_file.is_file():
+        if not os.path.isfile(self.tasks_file):
             print(f"Warning: {self.tasks_file} exists but is not a file. Creating new tasks file.")
             self.save_tasks()
             return []
         
+        stat = os.stat(self.tasks_file)
+        key = (stat.st_mtime_ns, stat.st_size)
+        tasks = self.load_cache(key)
+        if tasks is not None:
+            return tasks
+
         try:
-            with open(self.tasks_file, "r") as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    return [Task.from_dict(item) for item in data]
+            with open(self.tasks_file, "rb") as f:
+                if stat.st_size > MMAP_THRESHOLD:
+                    import mmap
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        tasks = self.parse_lines(iter(mm.readline, b""))
                 else:
-                    print(f"Warning: Invalid format in tasks file. Expected list, got {type(data)}. Creating backup.")
-                    self.create_backup()
-                    return []
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    tasks = self.parse_lines(f)
+            if not self._needs_rewrite:
+                self.save_cache(key, tasks)
+            return tasks
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
             print(f"Error loading tasks file: {e}. Creating backup.")
             self.create_backup()
+            self._needs_rewrite = True
+            return []
+
+    def parse_lines(self, lines) -> List[Task]:
+        """Build tasks from JSON Lines, one task object per line, skipping lines that cannot be parsed."""
+        tasks = []
+        bad_lines = []
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+                try:
+                    tasks.append(Task(*TASK_FIELDS(record)))
+                except (KeyError, TypeError):
+                    # Slow path: from_dict fills in defaults or raises for a malformed record
+                    tasks.append(Task.from_dict(record))
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                bad_lines.append(line_number)
+        if bad_lines:
+            print(f"Warning: Skipped malformed lines in tasks file: {', '.join(map(str, bad_lines))}. Creating backup.")
+            self.create_backup()
+            self._needs_rewrite = True
+        return tasks
+
+    def cache_file(self) -> str:
+        # Escape the absolute path into a file name; hashing it would pull in hashlib on every command
+        name = os.path.realpath(self.tasks_file).replace("%", "%25").replace(os.sep, "%2F").replace(":", "%3A")
+        return os.path.join(CACHE_DIR, f"{name}.pkl")
+
+    def load_cache(self, key):
+        """Return the pickled tasks if they were cached for this exact (mtime_ns, size) of the tasks file."""
+        try:
+            with open(self.cache_file(), "rb") as f:
+                cached_key, records = pickle.load(f)
+            if cached_key != key:
+                return None
+            # starmap calls Task directly on each tuple without a Python-level loop body
+            return list(itertools.starmap(Task, records))
+        except Exception:
+            # A missing or unreadable cache just means parsing the JSON file
+            return None
+
+    def save_cache(self, key, tasks: List[Task]):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            records = [(task.description, task.completed) for task in tasks]
+            with open(self.cache_file(), "wb") as f:
+                pickle.dump((key, records), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # The cache is only an optimisation; failing to write it must never break a command
+            pass
+
+    def refresh_cache(self):
+        """Re-key the cache to the file just written, so the next command loads from it instead of parsing."""
+        try:
+            stat = os.stat(self.tasks_file)
+        except OSError:
+            return
+        self.save_cache((stat.st_mtime_ns, stat.st_size), self.tasks)
+
+    def load_legacy_tasks(self) -> List[Task]:
+        """Read the tasks.json array used by older versions so it can be rewritten as JSON Lines."""
+        try:
+            with open(self.legacy_file, "rb") as f:
+                tasks = [Task.from_dict(item) for item in orjson.loads(f.read())]
+            print(f"Migrated {len(tasks)} tasks from {self.legacy_file} to {self.tasks_file}")
+            return tasks
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"Error migrating legacy tasks file: {e}. Starting with an empty task list.")
             return []
 
     def create_backup(self):
-        backup_path = self.tasks_file.with_suffix('.bak')
+        import shutil  # only needed on this rare recovery path
+        backup_path = os.path.splitext(self.tasks_file)[0] + ".bak"
         try:
             shutil.copy2(self.tasks_file, backup_path)
             print(f"Created backup of corrupted file: {backup_path}")
@@ -59,21 +170,54 @@ class TaskTracker:
             print(f"Failed to create backup: {e}")
 
     def save_tasks(self):
+        # Write to a temporary file and swap it in, so a crash never leaves a half-written tasks file
+        tmp_file = os.path.splitext(self.tasks_file)[0] + ".tmp"
         try:
-            with open(self.tasks_file, "w") as f:
-                json.dump([task.to_dict() for task in self.tasks], f, indent=4)
+            data = b"".join(orjson.dumps(task.to_dict()) + b"\n" for task in self.tasks)
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.tasks_file)
+            self._needs_rewrite = False
+            self.refresh_cache()
         except IOError as e:
             print(f"Error saving tasks: {e}")
         except Exception as e:
             print(f"Unexpected error saving tasks: {e}")
 
-    def add_task(self, description: str):
-        if not description.strip():
+    def append_task(self, task: Task):
+        record = orjson.dumps(task.to_dict()) + b"\n"
+        try:
+            with open(self.tasks_file, "ab+") as f:
+                # Start on a fresh line if the file does not end with a newline (e.g. an interrupted append)
+                if os.fstat(f.fileno()).st_size > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        record = b"\n" + record
+                f.write(record)
+            self.refresh_cache()
+        except IOError as e:
+            print(f"Error saving task: {e}")
+
+    def compact(self):
+        """Rewrite the tasks file with exactly one line per current task."""
+        self.save_tasks()
+        print(f"Compacted tasks file: {len(self.tasks)} tasks.")
+
+    def add_task(self, description: str, defer_save: bool = False):
+        description = description.strip()
+        if not description:
             print("Error: Task description cannot be empty.")
             return
-        task = Task(description.strip())
+        task = Task(description)
         self.tasks.append(task)
-        self.save_tasks()
+        self._open.append(len(self.tasks) - 1)
+        if not defer_save:
+            if self._needs_rewrite:
+                self.save_tasks()
+            else:
+                self.append_task(task)
         print(f"Task added: {task}")
 
     def list_tasks(self):
@@ -81,13 +225,12 @@ class TaskTracker:
             print("No tasks found.")
             return
         
-        print("\nYour Tasks:")
-        print("-" * 40)
-        for i, task in enumerate(self.tasks, 1):
-            print(f"{i}. {task}")
-        print("-" * 40)
+        lines = ["\nYour Tasks:", "-" * 40]
+        lines.extend(f"{i}. {task}" for i, task in enumerate(self.tasks, 1))
+        lines.append("-" * 40)
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def complete_task(self, task_index: int):
+    def complete_task(self, task_index: int, defer_save: bool = False):
         if not self.tasks:
             print("No tasks found.")
             return
@@ -95,10 +238,14 @@ class TaskTracker:
             print(f"Error: Invalid task index. Please choose a number between 1 and {len(self.tasks)}.")
             return
         self.tasks[task_index - 1].completed = True
-        self.save_tasks()
+        pos = bisect.bisect_left(self._open, task_index - 1)
+        if pos < len(self._open) and self._open[pos] == task_index - 1:
+            del self._open[pos]
+        if not defer_save:
+            self.save_tasks()
         print(f"Task {task_index} marked as completed: {self.tasks[task_index - 1]}")
 
-    def remove_task(self, task_index: int):
+    def remove_task(self, task_index: int, defer_save: bool = False):
         if not self.tasks:
             print("No tasks found.")
             return
@@ -106,7 +253,13 @@ class TaskTracker:
             print(f"Error: Invalid task index. Please choose a number between 1 and {len(self.tasks)}.")
             return
         removed_task = self.tasks.pop(task_index - 1)
-        self.save_tasks()
+        pos = bisect.bisect_left(self._open, task_index - 1)
+        if pos < len(self._open) and self._open[pos] == task_index - 1:
+            del self._open[pos]
+        for j in range(pos, len(self._open)):
+            self._open[j] -= 1
+        if not defer_save:
+            self.save_tasks()
         print(f"Task removed: {removed_task}")
 
     def in_progress_tasks(self):
@@ -114,21 +267,92 @@ class TaskTracker:
             print("No tasks found.")
             return
         
-        print("\nIn Progress Tasks:")
-        print("-" * 40)
-        for i, task in enumerate(self.tasks, 1):
-            if not task.completed:
-                print(f"{i}. {task}")
-        print("-" * 40)
+        lines = ["\nIn Progress Tasks:", "-" * 40]
+        lines.extend(f"{i + 1}. {self.tasks[i]}" for i in self._open)
+        lines.append("-" * 40)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def run_batch(self, lines):
+        """Apply commands like "add:Buy milk", "complete:3", "remove:2" with a single save."""
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            command, _, value = line.partition(":")
+            command = command.strip().lower()
+            try:
+                if command == "add":
+                    self.add_task(value, defer_save=True)
+                elif command == "complete":
+                    self.complete_task(int(value), defer_save=True)
+                elif command == "remove":
+                    self.remove_task(int(value), defer_save=True)
+                else:
+                    print(f"Error: Unknown batch command on line {line_number}: {command}")
+            except ValueError:
+                print(f"Error: Invalid task index on line {line_number}: {value.strip()}")
+        self.save_tasks()
+
+HELP = """usage: main.py [-h] [-a ADD] [-l] [-c COMPLETE] [-r REMOVE] [-i] [-b BATCH] [--compact]
+
+Simple Task Tracker
+
+options:
+  -h, --help            show this help message and exit
+  -a ADD, --add ADD     Add a new task
+  -l, --list            List all tasks
+  -c COMPLETE, --complete COMPLETE
+                        Complete a task by index
+  -r REMOVE, --remove REMOVE
+                        Remove a task by index
+  -i, --in-progress     List in progress tasks
+  -b BATCH, --batch BATCH
+                        Apply commands from a file (use - for stdin)
+  --compact             Rewrite the tasks file without stale lines
+"""
+
+VALUE_OPTIONS = {"-a", "--add", "-c", "--complete", "-r", "--remove", "-b", "--batch"}
+FLAG_OPTIONS = {"-l", "--list", "-i", "--in-progress", "--compact"}
+
+def usage_error(message: str):
+    print(HELP.split("\n", 1)[0], file=sys.stderr)
+    print(f"main.py: error: {message}", file=sys.stderr)
+    sys.exit(2)
 
 def main():
-    parser = argparse.ArgumentParser(description="Simple Task Tracker")
-    parser.add_argument("-a", "--add", type=str, help="Add a new task")
-    parser.add_argument("-l", "--list", action="store_true", help="List all tasks")
-    parser.add_argument("-c", "--complete", type=int, help="Complete a task by index")
-    parser.add_argument("-r", "--remove", type=int, help="Remove a task by index")
-    parser.add_argument("-i", "--in-progress", action="store_true", help="List in progress tasks")
-    args = parser.parse_args()
+    # argparse is deliberately avoided: building the parser costs more than most commands
+    cmd = sys.argv[1] if len(sys.argv) > 1 else None
+    value = None
+    if cmd and cmd.startswith("--") and "=" in cmd:
+        cmd, _, value = cmd.partition("=")
+    elif cmd and not cmd.startswith("--") and len(cmd) > 2 and cmd[:2] in VALUE_OPTIONS:
+        # Attached short-option value, e.g. -a"Buy milk" or -c3
+        cmd, value = cmd[:2], cmd[2:]
+    # Number of argv items the command consumes: script, option and a separate value if any
+    used = 2
+
+    if cmd is None or cmd in ("-h", "--help"):
+        if value is not None:
+            usage_error(f"argument {cmd}: ignored explicit argument '{value}'")
+        print(HELP, end="")
+        return
+    if cmd in VALUE_OPTIONS:
+        if value is None:
+            if len(sys.argv) < 3:
+                usage_error(f"argument {cmd}: expected one argument")
+            value = sys.argv[2]
+            used = 3
+        if cmd in ("-c", "--complete", "-r", "--remove"):
+            try:
+                value = int(value)
+            except ValueError:
+                usage_error(f"argument {cmd}: invalid int value: '{value}'")
+    elif cmd not in FLAG_OPTIONS:
+        usage_error(f"unrecognized arguments: {' '.join(sys.argv[1:])}")
+    elif value is not None:
+        usage_error(f"argument {cmd}: ignored explicit argument '{value}'")
+    if len(sys.argv) > used:
+        usage_error(f"unrecognized arguments: {' '.join(sys.argv[used:])}")
 
     try:
         task_tracker = TaskTracker()
@@ -137,18 +361,27 @@ def main():
         print("Please check your tasks file or try running with different permissions.")
         return
 
-    if args.add:
-        task_tracker.add_task(args.add)
-    elif args.list:
+    if cmd in ("-a", "--add"):
+        task_tracker.add_task(value)
+    elif cmd in ("-l", "--list"):
         task_tracker.list_tasks()
-    elif args.complete is not None:
-        task_tracker.complete_task(args.complete)
-    elif args.remove is not None:
-        task_tracker.remove_task(args.remove)
-    elif args.in_progress:
+    elif cmd in ("-c", "--complete"):
+        task_tracker.complete_task(value)
+    elif cmd in ("-r", "--remove"):
+        task_tracker.remove_task(value)
+    elif cmd in ("-i", "--in-progress"):
         task_tracker.in_progress_tasks()
-    else:
-        parser.print_help()
+    elif cmd in ("-b", "--batch"):
+        if value == "-":
+            task_tracker.run_batch(sys.stdin)
+        else:
+            try:
+                with open(value, "r") as f:
+                    task_tracker.run_batch(f)
+            except OSError as e:
+                print(f"Error reading batch file: {e}")
+    elif cmd == "--compact":
+        task_tracker.compact()
 
 if  __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,96 +1,198 @@
-import json
+import gzip
+import pathlib
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib import error, request
 
+import orjson
 
-def fetch_github_events(username: str):
-    """Запрашивает события пользователя с GitHub API."""
-    url = f"https://api.github.com/users/{username}/events"
+
+EVENTS_LIMIT = 10
+MAX_WORKERS = 8
+CACHE_DIR = pathlib.Path.home() / ".cache" / "gh_events"
+# Повторы при временных сбоях: паузы 0.3, 0.6, 1.2 с
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = (502, 503, 504)
+
+
+def load_cached_events(username: str):
+    """Возвращает сохранённые ETag и события пользователя, если они есть."""
     try:
-        with request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            return data, response.getcode()
-    except error.HTTPError as e:
-        if e.code == 404:
-            print("Ошибка: Пользователь не найден.")
-        elif e.code == 403:
-            print("Ошибка: Превышен лимит запросов к API (rate limit).")
-        else:
-            print(f"Ошибка HTTP {e.code}: {e.reason}")
-        return None, e.code
-    except error.URLError as e:
-        print(f"Ошибка сети: {e.reason}")
-        return None, None
-    except Exception as e:
-        print(f"Неожиданная ошибка: {e}")
+        with open(CACHE_DIR / f"{username}.json", "rb") as f:
+            cached = orjson.loads(f.read())
+        return cached["etag"], cached["events"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
         return None, None
 
 
-def format_event(event: dict) -> str:
-    """Преобразует событие в человекочитаемую строку."""
-    event_type = event.get("type")
-    repo_name = event["repo"]["name"]
+def save_cached_events(username: str, etag: str, events: list):
+    """Сохраняет ETag и события, чтобы в следующий раз сделать условный запрос."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_DIR / f"{username}.json", "wb") as f:
+            f.write(orjson.dumps({"etag": etag, "events": events}))
+    except OSError:
+        # Кэш необязателен: без него просто будет полный запрос
+        pass
 
-    if event_type == "PushEvent":
-        # В API нет количества коммитов в PushEvent.payload, но можно взять len(commits) — но его нет.
-        # Поэтому просто пишем "Pushed to..."
-        return f"Pushed to {repo_name}"
-
-    elif event_type == "IssuesEvent":
-        action = event["payload"]["action"]
-        issue_number = event["payload"]["issue"]["number"]
-        if action == "opened":
-            return f"Opened issue #{issue_number} in {repo_name}"
-        elif action == "closed":
-            return f"Closed issue #{issue_number} in {repo_name}"
-        else:
-            return f"{action.capitalize()} issue #{issue_number} in {repo_name}"
 
-    elif event_type == "IssueCommentEvent":
-        issue_number = event["payload"]["issue"]["number"]
-        return f"Commented on issue #{issue_number} in {repo_name}"
+def fetch_github_events(username: str):
+    """Запрашивает последние события пользователя с GitHub API.
+
+    Возвращает (события, HTTP-статус, текст ошибки). Ошибку не печатает сама:
+    функция выполняется в потоке, а вывод должен оказаться под заголовком пользователя.
+    """
+    # Просим у API только нужное количество событий, а не всю страницу из 30
+    url = f"https://api.github.com/users/{username}/events?per_page={EVENTS_LIMIT}"
+    cached_etag, cached_events = load_cached_events(username)
+    headers = {"Accept-Encoding": "gzip"}
+    if cached_etag:
+        headers["If-None-Match"] = cached_etag
+    for attempt in range(RETRIES + 1):
+        try:
+            with request.urlopen(request.Request(url, headers=headers), timeout=10) as response:
+                body = response.read()
+                if response.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                data = orjson.loads(body)
+                etag = response.headers.get("ETag")
+                if etag:
+                    save_cached_events(username, etag, data)
+                return data, response.getcode(), None
+        except error.HTTPError as e:
+            if e.code in RETRY_STATUSES and attempt < RETRIES:
+                time.sleep(BACKOFF_FACTOR * 2 ** attempt)
+                continue
+            if e.code == 304 and cached_events is not None:
+                # Данные не изменились с прошлого запроса — берём их из кэша
+                return cached_events, e.code, None
+            if e.code == 404:
+                message = "Ошибка: Пользователь не найден."
+            elif e.code == 403:
+                message = "Ошибка: Превышен лимит запросов к API (rate limit)."
+            else:
+                message = f"Ошибка HTTP {e.code}: {e.reason}"
+            return None, e.code, message
+        except OSError as e:
+            # URLError, а также таймаут или обрыв соединения во время чтения ответа
+            if attempt < RETRIES:
+                time.sleep(BACKOFF_FACTOR * 2 ** attempt)
+                continue
+            return None, None, f"Ошибка сети: {getattr(e, 'reason', e)}"
+        except Exception as e:
+            return None, None, f"Неожиданная ошибка: {e}"
+
+
+def _format_push(event: dict, repo_name: str) -> str:
+    # В API нет количества коммитов в PushEvent.payload, но можно взять len(commits) — но его нет.
+    # Поэтому просто пишем "Pushed to..."
+    return f"Pushed to {repo_name}"
+
+
+def _format_issues(event: dict, repo_name: str) -> str:
+    action = event["payload"]["action"]
+    issue_number = event["payload"]["issue"]["number"]
+    if action == "opened":
+        return f"Opened issue #{issue_number} in {repo_name}"
+    elif action == "closed":
+        return f"Closed issue #{issue_number} in {repo_name}"
+    else:
+        return f"{action.capitalize()} issue #{issue_number} in {repo_name}"
 
-    elif event_type == "ForkEvent":
-        return f"Forked {repo_name}"
 
-    elif event_type == "WatchEvent":
-        return f"Starred {repo_name}"
+def _format_issue_comment(event: dict, repo_name: str) -> str:
+    issue_number = event["payload"]["issue"]["number"]
+    return f"Commented on issue #{issue_number} in {repo_name}"
 
-    elif event_type == "PullRequestEvent":
-        action = event["payload"]["action"]
-        pr_number = event["payload"]["number"]
-        return f"{action.capitalize()} pull request #{pr_number} in {repo_name}"
 
-    else:
-        return f"Did something in {repo_name}"  # fallback
+def _format_fork(event: dict, repo_name: str) -> str:
+    return f"Forked {repo_name}"
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Использование: python github_activity.py <username>")
-        sys.exit(1)
+def _format_watch(event: dict, repo_name: str) -> str:
+    return f"Starred {repo_name}"
 
-    username = sys.argv[1].strip()
-    if not username:
-        print("Имя пользователя не может быть пустым.")
-        sys.exit(1)
 
-    print(f"Получение активности для пользователя: {username}\n")
+def _format_pull_request(event: dict, repo_name: str) -> str:
+    action = event["payload"]["action"]
+    pr_number = event["payload"]["number"]
+    return f"{action.capitalize()} pull request #{pr_number} in {repo_name}"
 
-    data, status = fetch_github_events(username)
 
-    if data is None:
-        sys.exit(1)
+def _format_default(event: dict, repo_name: str) -> str:
+    return f"Did something in {repo_name}"  # fallback
 
+
+# Тип события -> функция форматирования; один поиск в словаре вместо цепочки if/elif
+_EVENT_FORMATTERS = {
+    "PushEvent": _format_push,
+    "IssuesEvent": _format_issues,
+    "IssueCommentEvent": _format_issue_comment,
+    "ForkEvent": _format_fork,
+    "WatchEvent": _format_watch,
+    "PullRequestEvent": _format_pull_request,
+}
+
+
+def format_event(event: dict) -> str:
+    """Преобразует событие в человекочитаемую строку."""
+    repo_name = event["repo"]["name"]
+    return _EVENT_FORMATTERS.get(event.get("type"), _format_default)(event, repo_name)
+
+
+def print_activity(data: list):
+    """Печатает события одного пользователя."""
     if not data:
         print("Нет недавней активности.")
         return
 
-    # Выводим максимум первые 10 событий
-    for event in data[:10]:
+    # Выводим максимум первые EVENTS_LIMIT событий
+    for event in data[:EVENTS_LIMIT]:
         line = format_event(event)
         print(f"- {line}")
 
 
+def main():
+    if len(sys.argv) < 2:
+        print("Использование: python github_activity.py <username> [<username> ...]")
+        sys.exit(1)
+
+    usernames = [arg.strip() for arg in sys.argv[1:]]
+    if not all(usernames):
+        print("Имя пользователя не может быть пустым.")
+        sys.exit(1)
+
+    if len(usernames) == 1:
+        # Один пользователь: сообщаем о запросе до того, как он начнётся (он может идти с повторами)
+        username = usernames[0]
+        print(f"Получение активности для пользователя: {username}\n")
+        data, status, message = fetch_github_events(username)
+        failed = data is None
+        if failed:
+            print(message)
+        else:
+            print_activity(data)
+    else:
+        print(f"Получение активности для {len(usernames)} пользователей: {', '.join(usernames)}")
+
+        # Запросы упираются в сеть, поэтому для нескольких пользователей выполняем их параллельно
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(usernames))) as executor:
+            results = executor.map(fetch_github_events, usernames)
+
+            failed = False
+            for username, (data, status, message) in zip(usernames, results):
+                print(f"\nАктивность пользователя: {username}\n")
+                if data is None:
+                    print(message)
+                    failed = True
+                    continue
+                print_activity(data)
+
+    if failed:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()